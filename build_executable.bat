@@ -13,6 +13,11 @@ if exist build rmdir /s /q build
 if exist dist rmdir /s /q dist
 if exist "DnD_CharacterSheet_Generator.spec" del "DnD_CharacterSheet_Generator.spec"
 
+REM Generate the field mappings module bundled with the executable
+echo.
+echo Generating field mappings module...
+.venv\Scripts\python.exe tools\gen_mappings.py
+
 REM Build the executable
 echo.
 echo Building executable...
@@ -1,16 +1,33 @@
 #!/usr/bin/env python3
 """Auto-Fill D&D 5e Character Sheet - Simple file picker interface"""
 
+import io
 import re
 import json
+import multiprocessing
 import sys
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from pathlib import Path
+from typing import Optional
 from pypdf import PdfReader, PdfWriter
 
+# orjson is an optional speedup for loading field_mappings.json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Mappings pre-generated from field_mappings.json by tools/gen_mappings.py
+try:
+    import _generated_mappings
+except ImportError:
+    _generated_mappings = None
+
 # Fix for PyInstaller bundled executables where stdin/stdout/stderr may be None
 if getattr(sys, 'frozen', False):
     if sys.stdout is None:
@@ -20,6 +37,32 @@ if getattr(sys, 'frozen', False):
     if sys.stdin is None:
         sys.stdin = open(os.devnull, "r")
 
+# Whitespace other than "\n": every character str.strip() removes, including
+# non-ASCII ones such as NBSP (U+00A0). Text mode already turns "\r" and
+# "\r\n" into "\n", so carriage returns never reach the pattern.
+_WS = '\t\x0b\x0c\x1c-\x1f \x85\xa0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000'
+
+# Characters allowed in a template field name
+_NAME_CHARS = '[A-Za-z0-9_' + _WS + ']'
+
+# One "FieldName: value" block: the field line plus its continuation lines.
+# A continuation line is any following line that is not blank, not a
+# comment and does not itself start a new field.
+_BLOCK_RE = re.compile(
+    '^(' + _NAME_CHARS + '+?)[' + _WS + ']*:'
+    '(.*(?:\n(?![' + _WS + ']*$)(?!#)(?!' + _NAME_CHARS + '+:).*)*)',
+    re.MULTILINE
+)
+
+# Template filename suffixes stripped when deriving the character name
+_SUFFIX_RE = re.compile(r'(_PDF_[Tt]emplate|_[Tt]emplate|[Tt]emplate)$')
+
+# PDF field name prefixes that mark checkbox fields (a tuple for str.startswith)
+_CHECKBOX_PREFIXES = ("Check Box",)
+
+# Template values that tick a checkbox (compared after strip/lower)
+_CHECKBOX_TRUE = frozenset({'yes', '1', 'true', 'x', '✓'})
+
 
 def get_resource_path(relative_path):
     """Get absolute path to resource, works for dev and for PyInstaller."""
@@ -32,24 +75,54 @@ def get_resource_path(relative_path):
     return Path(base_path) / relative_path
 
 
+@lru_cache(maxsize=4)
+def _load_mappings_cached(path: str, mtime: float) -> dict:
+    """Parse a mappings JSON file once per (path, mtime)."""
+    data = Path(path).read_bytes()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _generated_mappings_usable(mappings_file: Path) -> bool:
+    """Check whether the generated mappings module can stand in for mappings_file."""
+    if _generated_mappings is None or mappings_file != get_resource_path("field_mappings.json"):
+        return False
+    # A bundled executable is immutable; otherwise the module must postdate the JSON
+    if getattr(sys, 'frozen', False):
+        return True
+    return Path(_generated_mappings.__file__).stat().st_mtime >= mappings_file.stat().st_mtime
+
+
 def load_field_mappings(mappings_file: Path) -> dict:
-    """Load field mappings from JSON file."""
+    """Load field mappings from JSON file, or from its generated module when up to date."""
     if not mappings_file.exists():
         return {}
-    with open(mappings_file, 'r', encoding='utf-8') as f:
-        mappings = json.load(f)
+    if _generated_mappings_usable(mappings_file):
+        return dict(_generated_mappings.MAPPINGS)
+    # Copy so callers can't modify the cached result
+    mappings = dict(_load_mappings_cached(str(mappings_file), mappings_file.stat().st_mtime))
     # Remove comment key if present
     mappings.pop('comment', None)
     return mappings
 
 
-def parse_character_template(template_path: Path) -> dict:
+def parse_character_template(
+    template_path: Path,
+    translate: Optional[dict] = None,
+    unmapped: Optional[list] = None
+) -> dict:
     """
     Parse a character sheet text template into a dictionary of PDF field values.
     Supports multi-line values for large text fields.
 
     Args:
         template_path: Path to the text template file
+        translate: Optional field mappings; field names found in it are
+            translated as they are parsed. If any name is translated, the
+            template is standardized and its unmapped names are skipped;
+            otherwise all names are kept unchanged.
+        unmapped: Optional list that skipped field names are appended to
 
     Returns:
         Dictionary mapping PDF field names to their values
@@ -61,56 +134,122 @@ def parse_character_template(template_path: Path) -> dict:
           more lines
     """
     field_values = {}
+    untranslated = {}
 
+    # Text mode gives universal newlines, matching the old line-based parser
     with open(template_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+        text = f.read()
 
-    i = 0
-    while i < len(lines):
-        line = lines[i].rstrip()
+    for match in _BLOCK_RE.finditer(text):
+        field_name = match.group(1).strip()
+        value_lines = match.group(2).split('\n')
 
-        # Skip empty lines and comments
-        if not line or line.startswith('#'):
-            i += 1
-            continue
+        # Join multi-line values with newlines
+        final_value = '\n'.join(line.rstrip() for line in value_lines).strip()
 
-        # Check if line matches "FieldName: value" pattern
-        match = re.match(r'^([A-Za-z0-9_\s]+?)\s*:\s*(.*)$', line)
-        if match:
-            field_name = match.group(1).strip()
-            value = match.group(2).strip()
-
-            # Check for multi-line value (next lines are indented or continuations)
-            i += 1
-            value_lines = [value] if value else []
-
-            while i < len(lines):
-                next_line = lines[i].rstrip()
-
-                # If next line is indented or doesn't match field pattern, it's a continuation
-                if next_line and not next_line.startswith('#'):
-                    # Check if it's a new field
-                    if re.match(r'^([A-Za-z0-9_\s]+?)\s*:', next_line):
-                        break
-                    # It's a continuation line
-                    value_lines.append(next_line)
-                    i += 1
-                else:
-                    i += 1
-                    break
-
-            # Join multi-line values with newlines
-            final_value = '\n'.join(value_lines).strip()
-
-            # Skip empty values and placeholders
-            if final_value and final_value != '[empty]' and not final_value.startswith('[MULTI-LINE]'):
+        # Skip empty values and placeholders
+        if final_value and final_value != '[empty]' and not final_value.startswith('[MULTI-LINE]'):
+            if translate is None:
                 field_values[field_name] = final_value
-        else:
-            i += 1
+            elif translate.get(field_name):
+                field_values[translate[field_name]] = final_value
+            else:
+                untranslated[field_name] = final_value
+
+    # Nothing translated: a direct PDF template, keep its names as they are
+    if not field_values:
+        return untranslated
+
+    # Standardized template: fields not in mappings are skipped
+    if unmapped is not None:
+        unmapped.extend(untranslated)
 
     return field_values
 
 
+@lru_cache(maxsize=4)
+def _load_blank(path: str, mtime: float) -> tuple[dict, dict, frozenset, dict, bytes]:
+    """
+    Parse a blank PDF form once and cache the result.
+
+    The blank sheet never changes between fills, so it is read and parsed
+    once per process. The cache is keyed on the file's mtime so an edited
+    blank sheet is picked up on the next fill.
+
+    Returns:
+        Tuple of (pdf_fields, norm_index, checkbox_names, field_pages,
+        blank_bytes) where norm_index maps stripped field names to PDF field
+        names, field_pages maps field names to the indices of the pages holding
+        their widgets, and blank_bytes is the blank form's file content
+    """
+    blank_bytes = Path(path).read_bytes()
+    reader = PdfReader(io.BytesIO(blank_bytes))
+    pdf_fields = reader.get_fields() or {}
+
+    # Index PDF field names by their stripped form (first match wins) so
+    # common variations like trailing spaces resolve with one lookup
+    norm_index = {}
+    for pdf_field in pdf_fields:
+        norm_index.setdefault(pdf_field.strip(), pdf_field)
+
+    checkbox_names = frozenset(
+        name for name in pdf_fields if name.startswith(_CHECKBOX_PREFIXES)
+    )
+
+    # Identify the pages where each field is used
+    field_pages = {}
+    for page_index, page in enumerate(reader.pages):
+        for name in _page_field_names(page):
+            field_pages.setdefault(name, []).append(page_index)
+
+    return pdf_fields, norm_index, checkbox_names, field_pages, blank_bytes
+
+
+def _qualified_field_name(field) -> str:
+    """
+    Return a form field's fully qualified name, e.g. "Stats.STR".
+    Mirrors pypdf: partial /T names are joined with dots up the /Parent
+    chain, and a /TM entry overrides the name.
+    """
+    parts = []
+    visited = set()
+    while id(field) not in visited:
+        visited.add(id(field))
+        if '/TM' in field:
+            parts.append(field['/TM'])
+            break
+        parts.append(field.get('/T', ''))
+        if '/Parent' not in field:
+            break
+        field = field['/Parent']
+    return '.'.join(reversed(parts))
+
+
+def _page_field_names(page) -> set:
+    """Return the names of the form fields with a widget on the given page."""
+    names = set()
+    if '/Annots' not in page:
+        return names
+
+    for annot in page['/Annots']:
+        annot = annot.get_object()
+        if annot.get('/Subtype') != '/Widget':
+            continue
+        # As in update_page_form_field_values, a widget that isn't itself a
+        # named field belongs to its parent field
+        if '/FT' in annot and '/T' in annot:
+            field = annot
+        elif '/Parent' in annot:
+            field = annot['/Parent']
+        else:
+            continue
+        # Fields are matched by qualified name or by their partial /T name
+        names.add(_qualified_field_name(field))
+        if '/T' in field:
+            names.add(field['/T'])
+    return names
+
+
 def fill_pdf_form(input_pdf: Path, output_pdf: Path, field_values: dict) -> tuple[int, int]:
     """
     Fill a PDF form with the provided field values.
@@ -124,73 +263,69 @@ def fill_pdf_form(input_pdf: Path, output_pdf: Path, field_values: dict) -> tupl
     Returns:
         Tuple of (fields_filled, fields_not_found)
     """
-    reader = PdfReader(input_pdf)
-    writer = PdfWriter()
-
-    # Get available PDF fields for validation
-    pdf_fields = reader.get_fields()
+    # Get available PDF fields for validation (parsed once, then cached)
+    pdf_fields, norm_index, checkbox_names, field_pages, blank_bytes = _load_blank(
+        str(input_pdf), os.path.getmtime(input_pdf)
+    )
     if not pdf_fields:
         raise ValueError(f"No form fields found in {input_pdf}")
 
-    # Append all pages from reader to writer
-    writer.append(reader)
+    # Open the cached blank form incrementally: writing it out copies the
+    # blank bytes unchanged and appends only the modified field objects
+    writer = PdfWriter(io.BytesIO(blank_bytes), incremental=True)
 
     fields_filled = 0
     fields_not_found = 0
 
-    # Update form fields page by page
-    for page_num, page in enumerate(writer.pages):
-        page_updates = {}
-
-        for field_name, value in field_values.items():
-            # Check if field exists in PDF
-            if field_name in pdf_fields:
-                # Handle checkbox fields (Check Box N)
-                if field_name.startswith("Check Box"):
-                    # Checkbox: "Yes" = checked, anything else = unchecked
-                    if value and str(value).strip().lower() in (
-                        'yes', '1', 'true', 'x', '✓'
-                    ):
-                        page_updates[field_name] = "/Yes"
-                    else:
-                        page_updates[field_name] = "/Off"
-                else:
-                    # Regular text field
-                    page_updates[field_name] = str(value)
-                fields_filled += 1
-            else:
-                # Check for common variations (trailing spaces, etc.)
-                field_found = False
-                for pdf_field in pdf_fields.keys():
-                    if pdf_field.strip() == field_name.strip():
-                        # Handle checkbox fields
-                        if pdf_field.startswith("Check Box"):
-                            if value and str(value).strip().lower() in (
-                                'yes', '1', 'true', 'x', '✓'
-                            ):
-                                page_updates[pdf_field] = "/Yes"
-                            else:
-                                page_updates[pdf_field] = "/Off"
-                        else:
-                            page_updates[pdf_field] = str(value)
-                        fields_filled += 1
-                        field_found = True
-                        break
-
-                if not field_found:
-                    fields_not_found += 1
-
-        # Update fields for this page
-        if page_updates:
-            writer.update_page_form_field_values(
-                page,
-                page_updates,
-                auto_regenerate=False
-            )
-
-    # Write the filled PDF
-    with open(output_pdf, 'wb') as output_file:
-        writer.write(output_file)
+    # Resolve every field against the PDF once
+    resolved = {}
+    for field_name, value in field_values.items():
+        # Check if field exists in PDF, allowing for common variations
+        if field_name in pdf_fields:
+            canonical = field_name
+        else:
+            canonical = norm_index.get(field_name.strip())
+            if canonical is None:
+                fields_not_found += 1
+                continue
+
+        # A field without a widget on any page can't be filled
+        if canonical not in field_pages:
+            fields_not_found += 1
+            continue
+
+        # Coerce once; both branches work from the same string
+        str_value = str(value)
+
+        # Handle checkbox fields (Check Box N)
+        if canonical in checkbox_names:
+            # Checkbox: "Yes" = checked, anything else = unchecked
+            # (no falsy value's string form is in _CHECKBOX_TRUE)
+            is_checked = str_value.strip().lower() in _CHECKBOX_TRUE
+            resolved[canonical] = "/Yes" if is_checked else "/Off"
+        else:
+            # Regular text field
+            resolved[canonical] = str_value
+        fields_filled += 1
+
+    # Group updates by page so pages without target fields are never visited
+    updates_by_page = {}
+    for pdf_field, value in resolved.items():
+        for page_index in field_pages[pdf_field]:
+            updates_by_page.setdefault(page_index, {})[pdf_field] = value
+
+    # Update fields page by page
+    for page_index, page_updates in updates_by_page.items():
+        writer.update_page_form_field_values(
+            writer.pages[page_index],
+            page_updates,
+            auto_regenerate=False
+        )
+
+    # Serialize in memory, then write the filled PDF in one call
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    Path(output_pdf).write_bytes(buffer.getvalue())
 
     return fields_filled, fields_not_found
 
@@ -210,32 +345,108 @@ def get_character_name_from_filename(template_path: Path) -> str:
     Returns:
         Character name string
     """
-    filename = template_path.stem  # Get filename without extension
-
-    # Remove common suffixes
-    suffixes_to_remove = [
-        '_PDF_Template',
-        '_PDF_template',
-        '_Template',
-        '_template',
-        'Template',
-        'template'
-    ]
-
-    for suffix in suffixes_to_remove:
-        if filename.endswith(suffix):
-            filename = filename[:-len(suffix)]
-            break
+    # Remove a common template suffix from the filename (without extension),
+    # then replace underscores with spaces
+    return _SUFFIX_RE.sub('', template_path.stem, count=1).replace('_', ' ').strip()
+
 
-    # Replace underscores with spaces
-    character_name = filename.replace('_', ' ').strip()
+def _fill_one(template_path: Path, output_pdf_path: Path) -> tuple[int, int, Optional[str]]:
+    """
+    Fill the character sheet for one template.
+    Runs in a batch worker process, so errors are returned rather than raised.
+
+    The PDF is written to a temporary file in the output directory and moved
+    into place only once complete, so a failed fill never touches an existing
+    file at output_pdf_path.
+
+    Returns:
+        Tuple of (fields_filled, fields_not_found, error_message)
+    """
+    blank_pdf_path = get_resource_path("character_sheets") / "dnd5e_blank_sheet.pdf"
+    mappings_file = get_resource_path("field_mappings.json")
+
+    # Output names are unique within a batch, so this temp name is too
+    temp_path = output_pdf_path.with_name(f".{output_pdf_path.name}.tmp")
+
+    try:
+        mappings = load_field_mappings(mappings_file)
+        field_values = parse_character_template(template_path, translate=mappings or None)
+        fields_filled, fields_not_found = fill_pdf_form(blank_pdf_path, temp_path, field_values)
+        os.replace(temp_path, output_pdf_path)
+    except Exception as e:
+        temp_path.unlink(missing_ok=True)
+        return 0, 0, str(e)
 
-    return character_name
+    return fields_filled, fields_not_found, None
+
+
+def run_batch(template_dir: Path) -> int:
+    """
+    Fill a character sheet for every .txt template in a directory.
+    Templates are independent, so they are filled in parallel worker processes.
+    """
+    if not template_dir.is_dir():
+        print(f"Error: Directory not found: {template_dir}")
+        return 1
+
+    blank_pdf_path = get_resource_path("character_sheets") / "dnd5e_blank_sheet.pdf"
+    if not blank_pdf_path.exists():
+        print("Error: Blank PDF not found.\n"
+              "Please ensure 'dnd5e_blank_sheet.pdf' is in character_sheets/")
+        return 1
+
+    template_paths = sorted(p for p in template_dir.glob("*.txt") if p.is_file())
+    if not template_paths:
+        print(f"No .txt templates found in {template_dir}")
+        return 0
+
+    # Work out every output path before filling so no two templates write
+    # the same PDF (compared case-insensitively for Windows)
+    jobs = []
+    rejected = []
+    claimed = {}
+    for template_path in template_paths:
+        character_name = get_character_name_from_filename(template_path)
+        if not character_name:
+            rejected.append((template_path, "no character name in filename"))
+            continue
+        output_pdf_path = template_path.with_name(f"{character_name}.pdf")
+        output_key = output_pdf_path.name.casefold()
+        if output_key in claimed:
+            rejected.append((template_path, f"{output_pdf_path.name} is already written for {claimed[output_key]}"))
+            continue
+        claimed[output_key] = template_path.name
+        jobs.append((template_path, output_pdf_path))
+
+    print(f"Filling {len(template_paths)} templates from {template_dir}...\n")
+    for template_path, reason in rejected:
+        print(f"✗ {template_path.name}: {reason}")
+
+    failures = len(rejected)
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_fill_one, *zip(*jobs)) if jobs else ()
+        for (template_path, output_pdf_path), (fields_filled, fields_not_found, error) in zip(jobs, results):
+            if error:
+                failures += 1
+                print(f"✗ {template_path.name}: {error}")
+            else:
+                print(f"✓ {template_path.name} -> {output_pdf_path.name} "
+                      f"({fields_filled} fields, {fields_not_found} not found in PDF)")
+
+    print(f"\nDone! {len(template_paths) - failures} of {len(template_paths)} sheets filled")
+    return 0 if failures == 0 else 1
 
 
 def main():
     """Main function: Check for generation prompt, guide user through LLM generation, then fill PDF."""
 
+    # Batch mode: fill every template in a directory without any dialogs
+    if len(sys.argv) > 1 and sys.argv[1] == "--batch":
+        if len(sys.argv) < 3:
+            print("Usage: python fill_character_sheet.py --batch <template_dir>")
+            return 1
+        return run_batch(Path(sys.argv[2]))
+
     # Hide the root tkinter window
     root = tk.Tk()
     root.withdraw()
@@ -300,35 +511,17 @@ def main():
     # Parse template
     print("\nParsing template...")
     try:
-        field_values = parse_character_template(template_path)
+        # Standardized field names are translated to PDF field names while
+        # parsing; templates already using PDF field names pass through
+        mappings = load_field_mappings(script_dir / "field_mappings.json")
+        unmapped_fields = []
+        field_values = parse_character_template(
+            template_path, translate=mappings or None, unmapped=unmapped_fields
+        )
         print(f"Parsed {len(field_values)} fields")
-
-        # Check if this is a standardized template (needs mapping)
-        mappings_file = script_dir / "field_mappings.json"
-        if mappings_file.exists():
-            # Check if template uses standardized field names
-            sample_fields = list(field_values.keys())[:5]
-            uses_standardized = any('_' in field for field in sample_fields)
-
-            if uses_standardized:
-                print("Applying field mappings...")
-                mappings = load_field_mappings(mappings_file)
-
-                # Translate standardized field names to PDF field names
-                translated_values = {}
-                unmapped_count = 0
-                for std_field, value in field_values.items():
-                    pdf_field = mappings.get(std_field)
-                    if pdf_field:
-                        translated_values[pdf_field] = value
-                    else:
-                        # Field not in mappings, skip
-                        unmapped_count += 1
-
-                field_values = translated_values
-                print(f"Mapped {len(field_values)} fields to PDF format")
-                if unmapped_count > 0:
-                    print(f"Warning: {unmapped_count} fields not in mapping")
+        if unmapped_fields:
+            # Includes fields intentionally left unmapped (see field_mappings.json)
+            print(f"Warning: {len(unmapped_fields)} fields not in mapping")
 
     except Exception as e:
         messagebox.showerror("Error", f"Error parsing template: {e}")
@@ -361,6 +554,8 @@ def main():
         )
 
         print(f"\nDone! Filled {fields_filled} fields")
+        if fields_not_found > 0:
+            print(f"Warning: {fields_not_found} fields not found in PDF")
         print(f"Saved: {output_pdf_path.absolute()}\n")
 
     except Exception as e:
@@ -370,9 +565,13 @@ def main():
         return 1
 
     msg = f"Filled {fields_filled} fields\nSaved: {output_pdf_path.name}"
+    if fields_not_found > 0:
+        msg += f"\n\n{fields_not_found} fields were not found in the PDF and were skipped"
     messagebox.showinfo("Success", msg)
     return 0
 
 
 if __name__ == "__main__":
+    # Required for batch worker processes in PyInstaller executables
+    multiprocessing.freeze_support()
     sys.exit(main())
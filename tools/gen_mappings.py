@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Generate _generated_mappings.py from field_mappings.json.
+
+The generated module holds the mappings as a Python dict literal so the
+filler can import them instead of parsing JSON at startup. Run this as part
+of the build (see build_executable.bat) after editing field_mappings.json.
+"""
+
+import json
+import pprint
+from pathlib import Path
+
+HEADER = '''"""Field mappings generated from field_mappings.json by tools/gen_mappings.py.
+
+Do not edit by hand; rerun the generator instead.
+"""
+
+'''
+
+
+def generate(mappings_file: Path, output_file: Path) -> int:
+    """Write the mappings module and return the number of mappings written."""
+    with open(mappings_file, 'r', encoding='utf-8') as f:
+        mappings = json.load(f)
+
+    # Match load_field_mappings: the comment key is not a mapping
+    mappings.pop('comment', None)
+
+    body = pprint.pformat(mappings, indent=1, width=100, sort_dicts=False)
+    output_file.write_text(f"{HEADER}MAPPINGS = {body}\n", encoding='utf-8')
+    return len(mappings)
+
+
+def main():
+    """Main function: regenerate the mappings module next to the main script."""
+    root_dir = Path(__file__).resolve().parent.parent
+    mappings_file = root_dir / "field_mappings.json"
+    output_file = root_dir / "_generated_mappings.py"
+
+    if not mappings_file.exists():
+        print(f"Error: Mappings file not found: {mappings_file}")
+        return 1
+
+    count = generate(mappings_file, output_file)
+    print(f"Wrote {count} mappings to {output_file.name}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -6,6 +6,17 @@ import json
 from pathlib import Path
 import sys
 
+# Standardized "Field_Name: value" line pattern
+_FIELD_RE_STRICT = re.compile(r'^([A-Za-z0-9_]+)\s*:\s*(.*)$')
+
+# Fields every character sheet must fill in (optional fields are okay)
+_CRITICAL_FIELDS = frozenset({
+    'Character_Name', 'Character_Class_Level', 'Character_Race',
+    'Ability_Strength', 'Ability_Dexterity', 'Ability_Constitution',
+    'Ability_Intelligence', 'Ability_Wisdom', 'Ability_Charisma',
+    'HP_Maximum', 'Combat_ArmorClass'
+})
+
 
 def load_expected_fields(mappings_file: Path) -> set:
     """Load expected standardized field names from mappings file."""
@@ -30,33 +41,46 @@ def parse_template_fields(template_path: Path) -> dict:
     invalid_fields = []
     line_numbers = {}
 
-    with open(template_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    lines = template_path.read_bytes().splitlines()
+
+    match_field = _FIELD_RE_STRICT.match
 
     for line_num, line in enumerate(lines, 1):
         line = line.strip()
-        
-        # Skip empty lines, comments, and section headers
-        if not line or line.startswith('#') or line.startswith('=') or line.startswith('D&D'):
+
+        # Skip empty lines, comments, and section headers before decoding
+        if not line or line.startswith((b'#', b'=', b'D&D')):
             continue
-        
+
+        line = line.decode('utf-8').strip()
+
         # Check if line matches "FieldName: value" pattern
-        match = re.match(r'^([A-Za-z0-9_]+)\s*:\s*(.*)$', line)
-        if match:
+        name, sep, value = line.partition(':')
+        if not sep:
+            continue
+
+        # Plain "Name: value" lines skip the regex; anything unusual falls back to it
+        field_name = name.rstrip()
+        if field_name.isascii() and field_name.replace('_', '').isalnum():
+            value = value.strip()
+        else:
+            match = match_field(line)
+            if not match:
+                continue
             field_name = match.group(1)
             value = match.group(2).strip()
-            
-            # Check if field name uses standardized format (contains underscore)
-            if '_' in field_name:
-                found_fields.add(field_name)
-                line_numbers[field_name] = line_num
-            else:
-                # Field name doesn't use standardized format
-                invalid_fields.append({
-                    'line': line_num,
-                    'field': field_name,
-                    'reason': 'Field name missing underscore (not standardized format)'
-                })
+
+        # Check if field name uses standardized format (contains underscore)
+        if '_' in field_name:
+            found_fields.add(field_name)
+            line_numbers[field_name] = line_num
+        else:
+            # Field name doesn't use standardized format
+            invalid_fields.append({
+                'line': line_num,
+                'field': field_name,
+                'reason': 'Field name missing underscore (not standardized format)'
+            })
 
     return {
         'found_fields': found_fields,
@@ -79,20 +103,10 @@ def validate_template(template_path: Path, mappings_file: Path) -> dict:
     invalid_fields = parsed['invalid_fields']
 
     # Check for missing expected fields (optional fields are okay)
-    missing_critical_fields = []
-    critical_fields = {
-        'Character_Name', 'Character_Class_Level', 'Character_Race',
-        'Ability_Strength', 'Ability_Dexterity', 'Ability_Constitution',
-        'Ability_Intelligence', 'Ability_Wisdom', 'Ability_Charisma',
-        'HP_Maximum', 'Combat_ArmorClass'
-    }
-
-    for field in critical_fields:
-        if field not in found_fields:
-            missing_critical_fields.append(field)
+    missing_critical_fields = sorted(_CRITICAL_FIELDS - found_fields)
 
     # Check for unexpected fields (not in mappings)
-    unexpected_fields = found_fields - expected_fields
+    unexpected_fields = sorted(found_fields - expected_fields)
 
     # Calculate validation score
     uses_standardized_format = len(invalid_fields) == 0
@@ -109,7 +123,7 @@ def validate_template(template_path: Path, mappings_file: Path) -> dict:
         'expected_fields_count': len(expected_fields),
         'invalid_fields': invalid_fields,
         'missing_critical_fields': missing_critical_fields,
-        'unexpected_fields': list(unexpected_fields),
+        'unexpected_fields': unexpected_fields,
         'line_numbers': parsed['line_numbers']
     }
 